@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for the Vortex Python web app example.
+Run with: gunicorn app:app
+Override any setting with command-line flags or GUNICORN_CMD_ARGS,
+e.g. GUNICORN_CMD_ARGS="--bind 127.0.0.1:8001 --threads 8"
+"""
+
+import os
+
+bind = "0.0.0.0:8000"
+
+# Overshoot the worker count and dial back once you have measurements
+workers = int(os.environ.get("WEB_CONCURRENCY", 8))
+worker_class = "gthread"
+threads = 4
+
+# Keep idle connections open longer than nginx's upstream keepalive_timeout
+keepalive = 65
+
+# Load the app once in the master so workers fork with it already imported
+preload_app = True